@@ -6,21 +6,62 @@ Produces GitHub Actions annotations (::error / ::warning) with line numbers.
 Usage:
   python validate_editorconfig.py --schema .github/editorconfig-schema.json --file BionicCode.CodeStyle/.../.editorconfig \
     --known-rules-urls "<url1> <url2>" --fail-on-unknown-analysers false
+
+The known-rules lists are only downloaded when their warnings can matter:
+with --fail-on-unknown-analysers true, or when running under GitHub Actions.
 """
 
 import argparse
+import functools
+import hashlib
+import http.client
+import io
 import json
+import os
 import re
 import sys
+import tempfile
+import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+SECTION_RE = re.compile(r'^\s*\[(.+?)\]\s*$')
+KEYVAL_RE = re.compile(r'^\s*([^=]+?)\s*=\s*(.*?)\s*$')
+DIAG_SEV_RE = re.compile(r"^dotnet_diagnostic\.([A-Za-z0-9_]+)\.severity$", re.IGNORECASE)
+# Upstream lists are scanned as raw bytes; the pattern is pure ASCII.
+_ANALYZER_ID_BYTES_RE = re.compile(rb'\b[A-Z]{1,4}\d{2,5}\b')
+_WORD_BYTES = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_")
+# Built-in severities, used when the schema defines none and for "value:severity" values.
+_SEVERITY_NAMES = ("none", "silent", "suggestion", "warning", "error", "default")
+_SEVERITY_SET = frozenset(_SEVERITY_NAMES)
+_VALUE_WITH_SEVERITY_RE = re.compile(rf"^[^:]+(:(({'|'.join(_SEVERITY_NAMES)})))?$", re.IGNORECASE)
+_BOOL_SET = frozenset({"true", "false"})
+# Constructs that change meaning or fail once a pattern is wrapped in a group of
+# a larger alternation: numbered/named backreferences, group conditionals and
+# inline global flags such as (?i).
+_UNMERGEABLE_RE = re.compile(r'\\[1-9]|\(\?P=|\(\?\(|\(\?[aiLmsux]+\)')
+_LITERAL_PREFIX_RE = re.compile(r'^\^?([A-Za-z0-9_]+)([?*{]?)')
+# Longest token _ANALYZER_ID_BYTES_RE can match: 4 letters + 5 digits.
+ANALYZER_ID_MAX_LEN = 9
+DOWNLOAD_CHUNK_SIZE = 65536
+MAX_DOWNLOAD_WORKERS = 8
+ANNOTATION_BUFFER_SIZE = 65536
 
 def load_schema(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # Read the bytes once and parse with orjson when it is installed.
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
 
 def read_lines(path):
-    with open(path, "r", encoding='utf-8', errors='replace') as f:
-        return [ln.rstrip("\n") for ln in f.readlines()]
+    with open(path, "r", encoding='utf-8', errors='replace', buffering=65536) as f:
+        return [ln.rstrip("\n") for ln in f]
 
 def parse_editorconfig_lines(lines):
     """
@@ -31,82 +72,335 @@ def parse_editorconfig_lines(lines):
     section = None
     parsed = []
     parse_errors = []
-    section_re = re.compile(r'^\s*\[(.+?)\]\s*$')
-    comment_re = re.compile(r'^\s*[#;]')
-    keyval_re = re.compile(r'^\s*([^=]+?)\s*=\s*(.*?)\s*$')
-
     for idx, raw in enumerate(lines, start=1):
+        # strip() returns raw itself when there is nothing to trim, so this
+        # only allocates for indented or padded lines.
         s = raw.strip()
-        if s == "" or comment_re.match(s):
+        if not s or s[0] in "#;":
             continue
-        msec = section_re.match(raw)
-        if msec:
-            section = msec.group(1).strip()
-            continue
-        m = keyval_re.match(raw)
+        if s[0] == "[":
+            msec = SECTION_RE.match(raw)
+            if msec:
+                section = msec.group(1).strip()
+                continue
+        m = KEYVAL_RE.match(raw)
         if not m:
             parse_errors.append((idx, raw))
             continue
-        key = m.group(1).strip()
-        val = m.group(2).strip()
-        parsed.append((idx, section, key, val))
+        # KEYVAL_RE already excludes surrounding whitespace from both groups.
+        parsed.append((idx, section, m.group(1), m.group(2)))
     return parsed, parse_errors
 
+def scan_analyzer_ids(chunks):
+    """
+    Collect analyzer IDs from an iterable of bytes chunks without joining or
+    decoding them; only the matched IDs are decoded.
+    The trailing word fragment of each chunk is carried into the next one so an
+    ID split across a chunk boundary is neither missed nor truncated.
+    """
+    found = set()
+    carry = b""
+    for chunk in chunks:
+        data = carry + chunk
+        cut = len(data)
+        while cut and data[cut - 1] in _WORD_BYTES:
+            cut -= 1
+        found.update(_ANALYZER_ID_BYTES_RE.findall(data, 0, cut))
+        # A word longer than the longest ID cannot be one; keeping one extra
+        # byte is enough to reject its continuation in the next chunk.
+        carry = data[cut:][-(ANALYZER_ID_MAX_LEN + 1):]
+    found.update(_ANALYZER_ID_BYTES_RE.findall(carry))
+    return {m.decode("ascii") for m in found}
+
+def read_chunks(stream):
+    """
+    Yield the stream in DOWNLOAD_CHUNK_SIZE pieces. Sized reads return b"" on
+    early EOF instead of raising, so an HTTP body shorter than its
+    Content-Length raises IncompleteRead here, as a plain resp.read() would.
+    """
+    while True:
+        buf = stream.read(DOWNLOAD_CHUNK_SIZE)
+        if not buf:
+            break
+        yield buf
+    remaining = getattr(stream, "length", None)
+    if remaining:
+        raise http.client.IncompleteRead(b"", remaining)
+
+def analyzer_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "editorconfig-validator"
+
+def write_file_atomic(path, data):
+    tmp = tempfile.NamedTemporaryFile(dir=path.parent, delete=False)
+    try:
+        with tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+    except OSError:
+        try:
+            os.remove(tmp.name)
+        except OSError:
+            pass
+        raise
+
+def scan_and_cache(resp, body_path, meta_path):
+    """
+    Scan a 200 response for analyzer IDs while copying the body into the cache.
+    The body and its ETag / Last-Modified validators are stored only when the
+    server sent at least one validator and the whole body was received.
+    A failed or short read returns an empty set and caches nothing; cache
+    write failures are ignored.
+    """
+    meta = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+    if not (meta["etag"] or meta["last_modified"]):
+        return scan_analyzer_ids(read_chunks(resp))
+    try:
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = tempfile.NamedTemporaryFile(dir=body_path.parent, delete=False)
+    except OSError:
+        return scan_analyzer_ids(read_chunks(resp))
+
+    copied = True
+
+    def copy_to_cache(chunks):
+        # Write errors only stop the copy; read errors propagate to the caller.
+        nonlocal copied
+        for buf in chunks:
+            if copied:
+                try:
+                    tmp.write(buf)
+                except OSError:
+                    copied = False
+            yield buf
+
+    try:
+        try:
+            ids = scan_analyzer_ids(copy_to_cache(read_chunks(resp)))
+        except (OSError, http.client.HTTPException):
+            # Timeout, reset or truncated body: the list is incomplete.
+            return set()
+        try:
+            tmp.close()
+            if copied:
+                os.replace(tmp.name, body_path)
+                write_file_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError:
+            # Cache is best effort; the full body was already scanned.
+            pass
+        return ids
+    finally:
+        # Remove the temp file unless it was moved into place.
+        try:
+            tmp.close()
+        except OSError:
+            pass
+        try:
+            os.remove(tmp.name)
+        except OSError:
+            pass
+
+def fetch_analyzer_ids(url):
+    """
+    Download one rule list and return the analyzer IDs it mentions.
+    Responses are cached on disk keyed by URL and revalidated with
+    If-None-Match / If-Modified-Since; a 304 rescans the cached body.
+    """
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    cache_dir = analyzer_cache_dir()
+    meta_path = cache_dir / f"{key}.json"
+    body_path = cache_dir / f"{key}.bin"
+
+    headers = {}
+    try:
+        if body_path.exists():
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+    except (OSError, ValueError):
+        headers = {}
+
+    try:
+        req = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            if resp.status != 200:
+                return set()
+            return scan_and_cache(resp, body_path, meta_path)
+    except urllib.error.HTTPError as e:
+        with e:
+            if e.code != 304 or not headers:
+                return set()
+        try:
+            with open(body_path, "rb") as f:
+                return scan_analyzer_ids(read_chunks(f))
+        except OSError:
+            return set()
+    except Exception:
+        return set()
+
 def load_known_analyzer_ids(urls):
+    urls = [url.strip() for url in urls if url.strip()]
     ids = set()
-    for url in urls:
-        url = url.strip()
-        if not url:
-            continue
-        try:
-            with urllib.request.urlopen(url, timeout=10) as resp:
-                if resp.status != 200:
-                    continue
-                txt = resp.read().decode('utf-8', errors='ignore')
-                found = re.findall(r'\b[A-Z]{1,4}\d{2,5}\b', txt)
-                ids.update(found)
-        except Exception:
-            continue
+    if not urls:
+        return ids
+    with ThreadPoolExecutor(max_workers=min(MAX_DOWNLOAD_WORKERS, len(urls))) as ex:
+        futures = [ex.submit(fetch_analyzer_ids, url) for url in urls]
+        for f in as_completed(futures):
+            ids.update(f.result())
     return ids
 
-def match_schema_patterns(schema, key):
+def literal_prefix(patt):
+    """
+    Returns the literal text every key matched by patt must start with, or None
+    if the pattern does not begin with a plain literal (e.g. ".*" or "(?i)...").
+    """
+    if "|" in patt:
+        return None
+    m = _LITERAL_PREFIX_RE.match(patt)
+    if not m:
+        return None
+    prefix = m.group(1)
+    if m.group(2):
+        # The last character is optional or repeated zero times.
+        prefix = prefix[:-1]
+    return prefix or None
+
+def merge_patterns(entries):
     """
-    Find an applicable patternProperty in the loaded JSON schema.
-    Returns the schema fragment (dict) or None.
+    Merge compiled (group_name, key_regex, fragment, value_regex) entries into a
+    single alternation of named groups, tried in order.
+    Returns None when a pattern cannot be embedded unchanged (named groups,
+    backreferences, inline global flags) or the merged regex fails to compile;
+    the entries are then matched one by one.
     """
-    pps = schema.get("patternProperties", {})
-    for patt, frag in pps.items():
+    parts = []
+    for name, key_re, frag, value_re in entries:
+        if key_re.groupindex or _UNMERGEABLE_RE.search(key_re.pattern):
+            return None
+        parts.append(f"(?P<{name}>(?:{key_re.pattern}))")
+    if not parts:
+        return None
+    try:
+        return re.compile("|".join(parts))
+    except re.error:
+        return None
+
+def build_matcher(entries):
+    """
+    Returns (merged_regex, {group_name: (fragment, value_regex)}, entries) for
+    match_entries(); merged_regex is None when the entries must be tried one by one.
+    """
+    frags_by_group = {name: (frag, value_re) for name, key_re, frag, value_re in entries}
+    return merge_patterns(entries), frags_by_group, entries
+
+def match_entries(matcher, key):
+    merged_re, frags_by_group, entries = matcher
+    if merged_re is not None:
+        m = merged_re.match(key)
+        if not m:
+            return None, None
+        return frags_by_group[m.lastgroup]
+    for name, key_re, frag, value_re in entries:
+        if key_re.match(key):
+            return frag, value_re
+    return None, None
+
+def compile_schema_patterns(schema):
+    """
+    Compile the patternProperties of the loaded JSON schema once.
+    Returns (all_matcher, unprefixed_matcher, prefixes). all_matcher covers every
+    pattern in schema order; unprefixed_matcher covers, in the same order, only
+    the patterns without a literal prefix (e.g. the ".*" catch-all); prefixes are
+    the literal prefixes of all other patterns. A key starting with none of the
+    prefixes can only match an unprefixed pattern, so it skips the rest.
+    Key patterns that fail to compile are skipped; an invalid fragment "pattern"
+    raises re.error naming the schema key.
+    """
+    entries = []
+    unprefixed = []
+    prefixes = set()
+    for i, (patt, frag) in enumerate(schema.get("patternProperties", {}).items()):
         try:
-            if re.match(patt, key):
-                return frag
+            key_re = re.compile(patt)
         except re.error:
             continue
-    return None
+        value_re = None
+        if isinstance(frag, dict) and frag.get("pattern"):
+            try:
+                value_re = re.compile(frag["pattern"])
+            except re.error as e:
+                raise re.error(f"invalid value pattern for schema key /{patt}/: {e.msg}",
+                               frag["pattern"], e.pos) from e
+        entry = (f"g{i}", key_re, frag, value_re)
+        entries.append(entry)
+        prefix = literal_prefix(patt)
+        if prefix:
+            prefixes.add(prefix)
+        else:
+            unprefixed.append(entry)
+    return build_matcher(entries), build_matcher(unprefixed), tuple(sorted(prefixes))
+
+def match_schema_patterns(patterns, key):
+    """
+    Find the first applicable patternProperty, in schema order.
+    Returns the (fragment, value_regex) pair or (None, None).
+    """
+    all_matcher, unprefixed_matcher, prefixes = patterns
+    if key.startswith(prefixes):
+        return match_entries(all_matcher, key)
+    return match_entries(unprefixed_matcher, key)
 
-def validate_value_against_fragment(value, frag):
+@functools.lru_cache(maxsize=None)
+def ref_definition_name(ref):
+    """
+    Returns the definition name a "$ref" points at, e.g. "severity" for
+    "#/definitions/severity". Cached because every key repeats the same few refs.
+    """
+    return ref.rsplit("/", 1)[-1]
+
+def schema_severities(schema):
+    """
+    Returns the lower-cased severity enum of the schema as a frozenset plus its
+    display string for error messages, or (None, None) if the schema has none.
+    """
+    sev = schema.get("definitions", {}).get("severity", {}).get("enum", [])
+    if not sev:
+        return None, None
+    return frozenset(s.lower() for s in sev), ", ".join(sorted(sev))
+
+def validate_value_against_fragment(value, frag, value_re=None, severities=None, severity_display=None):
     """
     Basic validation for the small fragment types we use in schema:
     - $ref to definitions/severity/bool/value_with_severity
     - type: string + enum/pattern
     - if frag is {"$ref":"#/definitions/any"} accept
+    value_re is the precompiled fragment pattern, if any; severities and
+    severity_display come from schema_severities().
     """
     # direct $ref
     if isinstance(frag, dict) and "$ref" in frag:
-        ref = frag["$ref"]
-        if ref.endswith("/severity") or ref.endswith("#/definitions/severity"):
-            if value.lower() in {"none", "silent", "suggestion", "warning", "error", "default"}:
+        ref = ref_definition_name(frag["$ref"])
+        if ref == "severity":
+            if severities is None:
+                severities = _SEVERITY_SET
+            if value.lower() in severities:
                 return True, None
+            if severity_display:
+                return False, f"invalid severity '{value}', expected one of: {severity_display}"
             return False, f"invalid severity '{value}'"
-        if ref.endswith("/value_with_severity") or ref.endswith("#/definitions/value_with_severity"):
+        if ref == "value_with_severity":
             # form "value" or "value:severity"
-            if re.match(r"^[^:]+(:((none|silent|suggestion|warning|error|default)))?$", value, re.IGNORECASE):
+            if _VALUE_WITH_SEVERITY_RE.match(value):
                 return True, None
-            return False, f"value must be optionally suffixed with :severity where severity in [none,silent,suggestion,warning,error,default]"
-        if ref.endswith("/bool"):
-            if value.lower() in {"true", "false"}:
+            return False, f"value must be optionally suffixed with :severity where severity in [{','.join(_SEVERITY_NAMES)}]"
+        if ref == "bool":
+            if value.lower() in _BOOL_SET:
                 return True, None
             return False, f"boolean expected (true/false), got '{value}'"
-        if ref.endswith("/any"):
+        if ref == "any":
             return True, None
 
     # direct dict checks (type/pattern/enum)
@@ -120,7 +414,9 @@ def validate_value_against_fragment(value, frag):
                 return False, f"value must be one of {enum}, got '{value}'"
             pat = frag.get("pattern")
             if pat:
-                if re.match(pat, value):
+                if value_re is None:
+                    value_re = re.compile(pat)
+                if value_re.match(value):
                     return True, None
                 return False, f"value does not match pattern /{pat}/"
             # fallback accept
@@ -128,94 +424,146 @@ def validate_value_against_fragment(value, frag):
 
     return True, None
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--schema", required=True)
-    ap.add_argument("--file", required=True)
-    ap.add_argument("--known-rules-urls", default="", help="space-separated urls")
-    ap.add_argument("--fail-on-unknown-analysers", default="false")
-    args = ap.parse_args()
+def validate_key_value(patterns, fullkey, val, severities=None, severity_display=None):
+    """
+    Validate one key=value pair against the compiled schema patterns.
+    Returns (analyzer_rule, warning, error); each is None when not applicable.
+    """
+    frag, value_re = match_schema_patterns(patterns, fullkey)
+    if frag is None:
+        # Not matched by schema patternProperties; fallback: if key starts with dotnet_ allow but warn
+        if fullkey.startswith(("dotnet_", "csharp_", "csharp.")):
+            return None, f"Unrecognized dotnet/csharp key '{fullkey}'. Not in schema - consider adding it.", None
+        # Accept unknown non-dotnet keys (they can be other tools/editor settings)
+        return None, None, None
+
+    # Special case analyzer ID capture; keys are matched case-insensitively
+    rule = None
+    key_lower = fullkey.lower()
+    if key_lower.startswith("dotnet_diagnostic.") and key_lower.endswith(".severity"):
+        mdiag = DIAG_SEV_RE.match(key_lower)
+        if mdiag:
+            rule = mdiag.group(1).upper()
+
+    ok, msg = validate_value_against_fragment(val, frag, value_re, severities, severity_display)
+    if not ok:
+        return rule, None, f"Invalid value for '{fullkey}': {msg}"
+    return rule, None, None
+
+def annotations_requested():
+    return bool(os.environ.get("GITHUB_ACTIONS"))
+
+def open_annotation_stream():
+    """
+    Returns a text stream writing to stdout through a 64 KiB buffer, so
+    annotations can be written as they are found without one syscall each.
+    The stdout file descriptor is not closed with it. Falls back to sys.stdout
+    when stdout has no usable file descriptor.
+    """
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return sys.stdout
+    sys.stdout.flush()
+    raw = io.FileIO(fd, "w", closefd=False)
+    return io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=ANNOTATION_BUFFER_SIZE),
+                            encoding=sys.stdout.encoding, errors=sys.stdout.errors)
+
+def write_annotation(out, level, fname, ln, title, msg):
+    if ln:
+        out.write(f"::{level} file={fname},line={ln},title={title}::{msg}\n")
+    else:
+        out.write(f"::{level} file={fname},title={title}::{msg}\n")
+
+def run(args, out):
+    """
+    Validate args.file against args.schema, writing annotations to out as they
+    are found. Returns the process exit code.
+    """
+    fail_on_unknown = args.fail_on_unknown_analysers.lower() in ("1","true","yes")
 
     schema = load_schema(args.schema)
+    try:
+        patterns = compile_schema_patterns(schema)
+    except re.error as e:
+        write_annotation(out, "error", args.schema, None, "schema error", str(e))
+        return 1
+    severities, severity_display = schema_severities(schema)
     lines = read_lines(args.file)
     parsed, parse_errors = parse_editorconfig_lines(lines)
+    fname = args.file
 
     # Emit parse errors
-    failed = False
-    for ln, raw in parse_errors:
-        print(f"::error file={args.file},line={ln},title=.editorconfig parse error::Unrecognized line: {raw}")
-        failed = True
-    if failed:
-        sys.exit(1)
+    if parse_errors:
+        for ln, raw in parse_errors:
+            write_annotation(out, "error", fname, ln, ".editorconfig parse error", f"Unrecognized line: {raw}")
+        return 1
 
     # Validate each key
-    known_analyzers = set()
-    if args.known_rules_urls:
-        known_analyzers = load_known_analyzer_ids(args.known_rules_urls.split())
-
     used_analyzers = set()
-    warnings = []
-    errors = []
+    analyzer_lines = {}
+    has_warnings = False
+    has_errors = False
+    validated = {}
 
     for (ln, section, key, val) in parsed:
         # If key contains section qualifiers (not in this schema), validate full key
         fullkey = key
-        frag = match_schema_patterns(schema, fullkey)
-        if frag is None:
-            # Not matched by schema patternProperties; fallback: if key starts with dotnet_ allow but warn
-            if fullkey.startswith("dotnet_") or fullkey.startswith("csharp_") or fullkey.startswith("csharp."):
-                warnings.append((ln, f"Unrecognized dotnet/csharp key '{fullkey}'. Not in schema - consider adding it."))
-                continue
-            else:
-                # Accept unknown non-dotnet keys (they can be other tools/editor settings)
-                continue
-
-        # Special case analyzer ID capture
-        mdiag = re.match(r"^dotnet_diagnostic\.([A-Za-z0-9_]+)\.severity$", fullkey, re.IGNORECASE)
-        if mdiag:
-            rule = mdiag.group(1).upper()
+        # Repeated key=value pairs (e.g. the same rule under several sections)
+        # reuse the first outcome but are still reported at their own line.
+        outcome = validated.get((fullkey, val))
+        if outcome is None:
+            outcome = validate_key_value(patterns, fullkey, val, severities, severity_display)
+            validated[(fullkey, val)] = outcome
+        rule, warning, error = outcome
+        if rule:
             used_analyzers.add(rule)
+            analyzer_lines.setdefault(rule, ln)
+        if warning:
+            write_annotation(out, "warning", fname, ln, ".editorconfig warning", warning)
+            has_warnings = True
+        if error:
+            write_annotation(out, "error", fname, ln, ".editorconfig error", error)
+            has_errors = True
 
-        ok, msg = validate_value_against_fragment(val, frag)
-        if not ok:
-            errors.append((ln, f"Invalid value for '{fullkey}': {msg}"))
-            continue
-
-    # Unknown analyzer ID warnings
+    # Unknown analyzer ID warnings; the lists are not fetched when nothing consumes them
+    known_analyzers = set()
+    if args.known_rules_urls and used_analyzers and (fail_on_unknown or annotations_requested()):
+        known_analyzers = load_known_analyzer_ids(args.known_rules_urls.split())
     if known_analyzers:
         for rule in sorted(used_analyzers):
             if rule not in known_analyzers:
-                # find line
-                pattern = f"dotnet_diagnostic.{rule}.severity"
-                lineno = None
-                for i, l in enumerate(lines, start=1):
-                    if pattern.lower() in l.lower():
-                        lineno = i
-                        break
-                warnings.append((lineno or 1, f"Referenced analyzer '{rule}' not found in upstream lists; verify rule ID."))
-
-    # Emit warnings and errors
-    for ln, msg in warnings:
-        if ln:
-            print(f"::warning file={args.file},line={ln},title=.editorconfig warning::{msg}")
-        else:
-            print(f"::warning file={args.file},title=.editorconfig warning::{msg}")
-
-    for ln, msg in errors:
-        if ln:
-            print(f"::error file={args.file},line={ln},title=.editorconfig error::{msg}")
-        else:
-            print(f"::error file={args.file},title=.editorconfig error::{msg}")
+                lineno = analyzer_lines.get(rule)
+                write_annotation(out, "warning", fname, lineno or 1, ".editorconfig warning",
+                                 f"Referenced analyzer '{rule}' not found in upstream lists; verify rule ID.")
+                has_warnings = True
 
-    if errors:
-        sys.exit(1)
+    if has_errors:
+        return 1
 
-    if args.fail_on_unknown_analysers.lower() in ("1","true","yes") and warnings:
+    if fail_on_unknown and has_warnings:
         # escalate warnings to failure if requested (e.g. unknown analyzer IDs)
-        sys.exit(1)
+        return 1
+
+    out.write("Validation completed: no fatal schema violations.\n")
+    return 0
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--schema", required=True)
+    ap.add_argument("--file", required=True)
+    ap.add_argument("--known-rules-urls", default="",
+                    help="space-separated urls; only fetched with --fail-on-unknown-analysers true "
+                         "or when GITHUB_ACTIONS is set")
+    ap.add_argument("--fail-on-unknown-analysers", default="false")
+    args = ap.parse_args()
 
-    print("Validation completed: no fatal schema violations.")
-    sys.exit(0)
+    out = open_annotation_stream()
+    try:
+        code = run(args, out)
+    finally:
+        out.flush()
+    sys.exit(code)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()